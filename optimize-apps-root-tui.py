@@ -59,6 +59,9 @@ except ImportError as e:
     print("Install with: pip install textual rich pexpect", file=sys.stderr)
     sys.exit(1)
 
+# Package header and status of its first ISA entry in 'dumpsys package dexopt'
+_DEXOPT_ENTRY_RE = re.compile(r'\[([^\]]+)\][^\[]*?(?:arm64|arm):[^\[]*?\[status=([^\]]+)\]')
+
 
 # Flexoki Theme Colors
 class FlexokiColors:
@@ -1022,7 +1025,7 @@ class RootOptimizerApp:
                         self.title = "Error fetching packages"
                         return
 
-                    packages = [pkg.strip() for pkg in packages_output.split('\n') if pkg.strip()]
+                    packages = list(filter(None, map(str.strip, packages_output.splitlines())))
                     logging.info(f"Found {len(packages)} packages")
 
                     # Get dexopt status for all apps
@@ -1034,9 +1037,10 @@ class RootOptimizerApp:
 
                     # Parse and create AppInfo objects
                     logging.debug("Parsing app info...")
+                    status_map = self._parse_dexopt_statuses(dexopt_output, packages)
                     self.optimizer.apps = []
                     for package in packages:
-                        status = self._parse_optimization_status(package, dexopt_output)
+                        status = self._parse_optimization_status(package, status_map)
                         self.optimizer.apps.append(AppInfo(package, status))
 
                     # Sort by status and name
@@ -1054,17 +1058,22 @@ class RootOptimizerApp:
                     logging.error(traceback.format_exc())
                     self.title = error_msg
 
-            def _parse_optimization_status(self, package: str, dexopt_output: str) -> OptimizationStatus:
-                """Parse optimization status from dexopt output."""
-                try:
-                    pattern = rf'\[{re.escape(package)}\].*?(?:arm64:|arm:).*?\[status=([^\]]+)\]'
-                    match = re.search(pattern, dexopt_output, re.DOTALL)
-                    if match:
-                        status = match.group(1).lower().strip()
-                        return OptimizationStatus.from_string(status)
-                except:
-                    pass
-                return OptimizationStatus.UNKNOWN
+            def _parse_dexopt_statuses(self, dexopt_output: str, packages: List[str]) -> Dict[str, str]:
+                """Map each of the given packages to the status of its first ISA entry in the dexopt dump."""
+                wanted = set(packages)
+                status_map: Dict[str, str] = {}
+                for match in _DEXOPT_ENTRY_RE.finditer(dexopt_output):
+                    package = match.group(1)
+                    if package in wanted and package not in status_map:
+                        status_map[package] = match.group(2).lower().strip()
+                return status_map
+
+            def _parse_optimization_status(self, package: str, status_map: Dict[str, str]) -> OptimizationStatus:
+                """Look up a package's optimization status in the parsed dexopt statuses."""
+                status = status_map.get(package)
+                if status is None:
+                    return OptimizationStatus.UNKNOWN
+                return OptimizationStatus.from_string(status)
 
         app = OptimizerApp()
         app.run()
@@ -5,48 +5,64 @@ Interactive tool to optimize Android apps using Shizuku from a Python script.
 Uses Textual for a modern, interactive terminal UI with Flexoki theme.
 """
 
-import pexpect
+import asyncio
+import atexit
+import operator
+import os
+import queue
 import sys
-import re
+import select
+import subprocess
+import threading
+import time
 from typing import List, Dict, Tuple, Optional, Set
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from functools import lru_cache
 
 try:
+    from textual import work
     from textual.app import ComposeResult, Screen
-    from textual.containers import Container, Vertical, Horizontal, ScrollableContainer
+    from textual.containers import Horizontal, ScrollableContainer
     from textual.widgets import (
-        Static, Input, Label, Button, Checkbox, DataTable,
+        Static, Input, Label, Button, DataTable,
         Footer, Header, ProgressBar, RichLog
     )
     from textual.binding import Binding
     from textual.message import Message
-    from textual.events import Click
-    from rich.console import Console
     from rich.text import Text as RichText
-    from rich.panel import Panel
-    from rich.table import Table
     import logging
+    from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-    # Clear log file at startup to prevent bloat
-    try:
-        open('shizuku_optimizer.log', 'w').close()
-    except:
-        pass
-
-    # Set up file logging
-    logging.basicConfig(
-        filename='shizuku_optimizer.log',
-        level=logging.DEBUG,
-        format='%(asctime)s - %(message)s'
+    # Set up file logging, capped at 1MB plus two backups. Records are written
+    # by a listener thread so the UI never blocks on log I/O.
+    file_handler = RotatingFileHandler(
+        'shizuku_optimizer.log', maxBytes=1_000_000, backupCount=2
+    )
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+    log_queue: queue.Queue = queue.Queue(-1)
+    log_listener = QueueListener(log_queue, file_handler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+    logging.getLogger().addHandler(QueueHandler(log_queue))
+    # SHIZUKU_DEBUG=1 enables the verbose debug trace
+    logging.getLogger().setLevel(
+        logging.DEBUG if os.environ.get('SHIZUKU_DEBUG') == '1' else logging.WARNING
     )
 except ImportError:
     print("Error: Required packages not installed.")
-    print("Install with: pip install textual rich pexpect")
+    print("Install with: pip install textual rich")
     sys.exit(1)
 
 
+# Marker printed after every command; a per-command sequence number is appended
+SENTINEL = "__SHZ_END_"
+
+# Checkbox glyphs for the app selection table
+_CHECKED = "☑"
+_UNCHECKED = "☐"
+
+
 # Flexoki Theme Colors
 class FlexokiColors:
     """Flexoki theme color palette."""
@@ -100,101 +116,193 @@ class OptimizationStatus(Enum):
         else:
             return "Unknown Status"
 
-    @classmethod
-    def from_string(cls, status: str) -> 'OptimizationStatus':
-        """Convert status string to enum."""
-        status = status.lower().strip()
-        for item in cls:
-            if item.value[0] == status:
-                return item
-        return cls.UNKNOWN
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def from_string(status: str) -> 'OptimizationStatus':
+        """Convert status string to enum; the few distinct inputs are cached."""
+        return _STATUS_BY_NAME.get(status.lower().strip(), OptimizationStatus.UNKNOWN)
+
+
+# Per-status (name, color, group) looked up on every row render
+_STATUS_META: Dict[OptimizationStatus, Tuple[str, str, str]] = {
+    s: (s.value[0], s.value[1], s.get_group_name()) for s in OptimizationStatus
+}
+_STATUS_BY_NAME: Dict[str, OptimizationStatus] = {s.value[0]: s for s in OptimizationStatus}
 
+# Display order of the status groups in the app list
+GROUP_ORDER = [
+    "Fully Optimized",
+    "Partially Optimized",
+    "Minimally Optimized",
+    "Unknown Status",
+]
+GROUP_ORDER_INDEX: Dict[str, int] = {group: idx for idx, group in enumerate(GROUP_ORDER)}
 
-@dataclass
+
+# Sort key for the app list: status group, then package name
+_display_key = operator.attrgetter('_sort_key')
+
+
+@dataclass(slots=True)
 class AppInfo:
     """Data class for app information."""
     package_name: str
     optimization_status: OptimizationStatus
+    _search_blob: str = field(init=False, repr=False, compare=False)
+    _sort_key: Tuple[int, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.set_status(self.optimization_status)
+
+    def set_status(self, status: OptimizationStatus) -> None:
+        """Change the optimization status and refresh the derived search and sort keys."""
+        self.optimization_status = status
+        # Lowercased text matched by the search box; the newline keeps a query
+        # from matching across the package name and status
+        self._search_blob = f"{self.package_name.lower()}\n{status.value[0]}"
+        self._sort_key = (GROUP_ORDER_INDEX[_STATUS_META[status][2]], self.package_name)
 
     def __repr__(self) -> str:
         return f"{self.package_name} [{self.optimization_status.value[0]}]"
 
 
 class ShizukuWrapper:
-    """Wrapper class to handle Shizuku command execution via pexpect."""
+    """Wrapper class to handle Shizuku command execution over a persistent shell pipe."""
 
     def __init__(self, timeout: int = 30):
         self.timeout = timeout
-        self.child = None
+        self.process: Optional[subprocess.Popen] = None
+        self._buffer = bytearray()
+        self._seq = 0
+        # Commands are framed on one pipe, so only one thread may run them at a time
+        self._lock = threading.Lock()
 
     def connect(self) -> bool:
-        """Initialize Shizuku connection."""
+        """Initialize Shizuku connection; a live session is reused as is."""
+        if self.process and self.process.poll() is None:
+            return True
         try:
-            self.child = pexpect.spawn('shizuku', encoding='utf-8', timeout=self.timeout)
-            self.child.expect(r'\$ ', timeout=5)
+            self.process = subprocess.Popen(
+                ['shizuku'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+            self._buffer = bytearray()
+            # Round-trip a no-op so a dead or unauthorized shell fails here
+            script, marker = self._frame("true")
+            self._write(script)
+            if self._read_response(marker, timeout=5) is None:
+                raise TimeoutError("no response from shell")
             return True
         except Exception as e:
             print(f"Error connecting to Shizuku: {str(e)}")
+            # Don't leave a shell that never answered looking like a live session
+            if self.process:
+                self.process.kill()
+                self.process.wait()
+                self.process = None
             return False
 
+    def _frame(self, command: str) -> Tuple[str, bytes]:
+        """Return the script line for a command and the marker that ends its output.
+
+        The marker is printed on a line of its own followed by the exit status,
+        so output without a trailing newline is still framed correctly.
+        """
+        self._seq += 1
+        marker = f"{SENTINEL}{self._seq}"
+        script = f"{command}\nprintf '\\n%s %d\\n' {marker} \"$?\"\n"
+        return script, f"\n{marker} ".encode()
+
+    def _write(self, script: str) -> None:
+        """Send a script to the shell."""
+        self.process.stdin.write(script.encode())
+        self.process.stdin.flush()
+
+    def _read_response(self, marker: bytes, timeout: float) -> Optional[bytes]:
+        """Read output up to the given marker, or return None on timeout."""
+        fd = self.process.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        scan_from = 0
+
+        while True:
+            start = self._buffer.find(marker, scan_from)
+            if start != -1:
+                end = self._buffer.find(b"\n", start + len(marker))
+                if end != -1:
+                    output = bytes(self._buffer[:start])
+                    del self._buffer[:end + 1]
+                    return output
+            else:
+                # Only rescan the tail that could hold a partial marker
+                scan_from = max(0, len(self._buffer) - len(marker))
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise EOFError("Shizuku shell exited")
+            self._buffer += chunk
+
+    def _restart(self) -> None:
+        """Drop the current session and open a fresh one."""
+        if self.process:
+            self.process.kill()
+            self.process.wait()
+        self.connect()
+
     def execute_command(self, command: str) -> str:
         """Execute a command through Shizuku and return output."""
-        if not self.child:
-            return "Error: Not connected to Shizuku"
+        return self.execute_command_bytes(command).decode('utf-8', 'replace')
 
-        try:
-            self.child.sendline(command)
-            self.child.expect(r'\$ ', timeout=self.timeout)
-            output = self.child.before
-
-            # Remove echoed command line
-            lines = output.split('\n')
-            if lines and command in lines[0]:
-                lines = lines[1:]
-
-            return '\n'.join(lines).strip()
-        except pexpect.TIMEOUT:
-            return "Command timed out"
-        except Exception as e:
-            return f"Error: {str(e)}"
+    def execute_command_bytes(self, command: str) -> bytes:
+        """Execute a command through Shizuku and return its undecoded output."""
+        with self._lock:
+            if not self.process:
+                return b"Error: Not connected to Shizuku"
+
+            try:
+                script, marker = self._frame(command)
+                self._write(script)
+                output = self._read_response(marker, self.timeout)
+                if output is None:
+                    # The command is still running; a new session keeps framing in sync
+                    self._restart()
+                    return b"Error: Command timed out"
+                return output.strip()
+            except Exception as e:
+                return f"Error: {str(e)}".encode()
 
     def close(self):
         """Close Shizuku connection."""
-        if self.child:
+        if self.process:
             try:
-                self.child.sendline('exit')
-                self.child.wait()
-            except:
-                pass
+                self._write("exit\n")
+                self.process.wait(timeout=5)
+            except Exception:
+                self.process.kill()
+            self.process = None
 
 
-class AppListItem(Static):
-    """Clickable app item widget."""
+class AppsParsed(Message):
+    """The parsed app list for the selection screen."""
 
-    def __init__(self, app: AppInfo, is_selected: bool = False, parent_screen: 'AppSelectionScreen' = None):
+    def __init__(self, apps: List[AppInfo]):
         super().__init__()
-        self.app = app
-        self.is_selected = is_selected
-        self.parent_screen = parent_screen
-
-    def render(self) -> RichText:
-        """Render the app item."""
-        checkbox = "☑" if self.is_selected else "☐"
-        status = self.app.optimization_status.get_status_name()
-        color = self.app.optimization_status.get_color()
-
-        text_str = f"  {checkbox} [{color}]{self.app.package_name:<40}[/] [{color}]{status}[/]"
-        return RichText.from_markup(text_str)
-
-    def on_click(self) -> None:
-        """Handle click to toggle selection."""
-        if self.parent_screen:
-            if self.app.package_name in self.parent_screen.selected_packages:
-                self.parent_screen.selected_packages.remove(self.app.package_name)
-            else:
-                self.parent_screen.selected_packages.add(self.app.package_name)
-            self.is_selected = not self.is_selected
-            self.refresh()
+        self.apps = apps
+
+
+class StatusesReady(Message):
+    """Optimization statuses for apps that were listed before dexopt was parsed."""
+
+    def __init__(self, statuses: Dict[str, OptimizationStatus]):
+        super().__init__()
+        self.statuses = statuses
 
 
 class AppSelectionScreen(Screen):
@@ -209,10 +317,18 @@ class AppSelectionScreen(Screen):
         Binding("tab", "focus_table()", "Focus Table"),
     ]
 
-    def __init__(self, apps: List[AppInfo]):
+    # Seconds of typing pause before the filter is applied
+    FILTER_DEBOUNCE = 0.06
+    # DataTable.remove_row reindexes every row, so larger removals rebuild instead
+    MAX_ROW_REMOVALS = 8
+
+    def __init__(self, apps: List[AppInfo], loading: bool = False):
         super().__init__()
         self.apps = apps
-        self.filtered_apps = apps
+        self.loading = loading  # The apps arrive in an AppsParsed message
+        # Apps in display order (group, then name); filtering preserves it
+        self._sorted_apps = sorted(apps, key=_display_key)
+        self.filtered_apps = self._sorted_apps
         self.selected_packages: Set[str] = set()
         self.search_query = ""
         self.row_to_app: Dict[int, str] = {}  # Map row index to package name
@@ -221,6 +337,11 @@ class AppSelectionScreen(Screen):
         self.sort_column: Optional[str] = None  # 'package_name' or 'status'
         self.sort_descending = False
         self.sortable_column_keys: Dict[str, str] = {}
+        self._displayed_keys: Dict[str, str] = {}  # Map row key to DataTable RowKey, in display order
+        self._group_cache: Dict[str, Dict[str, List[AppInfo]]] = {}  # Search query -> sorted groups
+        self._filter_timer = None
+        self._table: Optional[DataTable] = None  # Cached on mount
+        self._search: Optional[Input] = None
 
     def compose(self) -> ComposeResult:
         """Compose the screen layout."""
@@ -238,7 +359,8 @@ class AppSelectionScreen(Screen):
 
     def on_mount(self) -> None:
         """Initialize the screen."""
-        table = self.query_one("#apps_table", DataTable)
+        self._table = table = self.query_one("#apps_table", DataTable)
+        self._search = self.query_one("#search_input", Input)
         # Store column keys returned by add_columns
         self.column_keys = table.add_columns("", "Package Name", "Status")
         logging.debug(f"Column keys: {self.column_keys}")
@@ -251,24 +373,67 @@ class AppSelectionScreen(Screen):
         table.cursor_type = "row"  # Enable row cursor
         self.update_apps_display()
         logging.debug(f"AppSelectionScreen mounted. Total apps: {len(self.apps)}")
-        self.query_one("#search_input", Input).focus()
+        self._search.focus()
 
     def on_input_changed(self, event: Input.Changed) -> None:
         """Handle search input changes."""
         self.search_query = event.value.lower()
+        # Coalesce bursts of keystrokes into a single refresh
+        if self._filter_timer is not None:
+            self._filter_timer.stop()
+        self._filter_timer = self.set_timer(self.FILTER_DEBOUNCE, self._apply_filter)
+
+    def _apply_filter(self) -> None:
+        """Apply the current search query to the table."""
+        self._filter_timer = None
+        self.filter_apps()
+        self.update_apps_display()
+
+    def on_apps_parsed(self, message: AppsParsed) -> None:
+        """Show the fetched apps in place of the loading row."""
+        self.apps.extend(message.apps)
+        # The apps come in display order, so this sort is a linear merge
+        self._sorted_apps.extend(message.apps)
+        self._sorted_apps.sort(key=_display_key)
+        self.loading = False
+        self._group_cache.clear()
         self.filter_apps()
         self.update_apps_display()
 
+    def on_statuses_ready(self, message: StatusesReady) -> None:
+        """Apply late-arriving optimization statuses and regroup the list."""
+        for app in self.apps:
+            status = message.statuses.get(app.package_name)
+            if status is not None and status is not app.optimization_status:
+                app.set_status(status)
+        self._sorted_apps.sort(key=_display_key)
+        self._group_cache.clear()
+        self.filter_apps()
+        # Every app may move to another group; keep the cursor on the same
+        # package, at the same height in the view
+        table = self._table
+        cursor_row = table.cursor_row
+        cursor_pkg = self.row_to_app.get(cursor_row)
+        view_offset = cursor_row - round(table.scroll_y)
+        # Kept rows would show their old status, so rebuild every row
+        table.clear()
+        self._displayed_keys = {}
+        self.update_apps_display()
+        # The package may no longer match the search once its status is known
+        if cursor_pkg in self._displayed_keys:
+            row = table.get_row_index(cursor_pkg)
+        else:
+            row = min(cursor_row, table.row_count - 1)
+        table.move_cursor(row=row, scroll=False)
+        table.scroll_to(y=max(0, row - view_offset), animate=False, immediate=True)
+
     def filter_apps(self) -> None:
         """Filter apps based on search query."""
         if not self.search_query:
-            self.filtered_apps = self.apps
+            self.filtered_apps = self._sorted_apps
         else:
-            self.filtered_apps = [
-                app for app in self.apps
-                if self.search_query in app.package_name.lower()
-                or self.search_query in app.optimization_status.get_status_name()
-            ]
+            q = self.search_query
+            self.filtered_apps = [app for app in self._sorted_apps if q in app._search_blob]
 
     def on_data_table_header_selected(self, event: DataTable.HeaderSelected) -> None:
         """Handle clicks on headers to toggle sorting."""
@@ -310,101 +475,113 @@ class AppSelectionScreen(Screen):
         if self.sort_column == "package_name":
             return lambda app: app.package_name.lower()
         if self.sort_column == "status":
-            return lambda app: app.optimization_status.get_status_name().lower()
+            return lambda app: _STATUS_META[app.optimization_status][0]
         return None
 
-    def update_apps_display(self) -> None:
-        """Update the apps list display grouped by status unless sorting is active."""
-        table = self.query_one("#apps_table", DataTable)
-        table.clear()
-        self.row_to_app = {}
-        self.row_keys = {}
-
+    def _build_rows(self) -> List[Tuple[str, Optional[AppInfo], Optional[RichText]]]:
+        """Return (row key, app, header label) for every row that should be shown."""
         if not self.filtered_apps:
-            table.add_row("[dim]No apps found[/dim]", "", "")
-            logging.debug("No filtered apps to display")
-            return
+            if self.loading:
+                return [("__loading__", None, RichText("Loading apps...", style="dim"))]
+            return [("__empty__", None, RichText("No apps found", style="dim"))]
 
         if self.sort_column:
-            apps_to_show = self._get_sorted_apps()
-            row_idx = 0
-            for app in apps_to_show:
-                checkbox = "☑" if app.package_name in self.selected_packages else "☐"
-                status = app.optimization_status.get_status_name()
-                color = app.optimization_status.get_color()
-
-                row_key = table.add_row(
-                    checkbox,
-                    app.package_name,
-                    f"[{color}]{status}[/]",
-                )
-                self.row_to_app[row_idx] = app.package_name
-                self.row_keys[row_idx] = row_key
-                row_idx += 1
+            return [(app.package_name, app, None) for app in self._get_sorted_apps()]
 
-            logging.debug(
-                f"Sorted view rows: {row_idx}, row_to_app entries {len(self.row_to_app)}, row_keys entries {len(self.row_keys)}"
-            )
-            return
-
-        grouped: Dict[str, List[AppInfo]] = {}
-        for app in self.filtered_apps:
-            group = app.optimization_status.get_group_name()
-            grouped.setdefault(group, []).append(app)
-
-        group_order = [
-            "Fully Optimized",
-            "Partially Optimized",
-            "Minimally Optimized",
-            "Unknown Status",
-        ]
-
-        row_idx = 0
-        for group in group_order:
+        grouped = self._get_grouped_apps()
+        rows: List[Tuple[str, Optional[AppInfo], Optional[RichText]]] = []
+        for group in GROUP_ORDER:
             if group not in grouped:
                 continue
+            rows.append((f"group:{group}", None, RichText(group, style="bold cyan")))
+            rows.extend((app.package_name, app, None) for app in grouped[group])
+        return rows
+
+    def _get_grouped_apps(self) -> Dict[str, List[AppInfo]]:
+        """Return the filtered apps grouped by status, each group sorted by name.
+
+        filtered_apps is already in display order, so one pass is enough. The
+        result only depends on the search query, so it is cached per query.
+        """
+        grouped = self._group_cache.get(self.search_query)
+        if grouped is None:
+            grouped = {}
+            for app in self.filtered_apps:
+                group = _STATUS_META[app.optimization_status][2]
+                grouped.setdefault(group, []).append(app)
+            self._group_cache[self.search_query] = grouped
+        return grouped
+
+    def _row_cells(self, app: Optional[AppInfo], label: Optional[RichText]) -> Tuple:
+        """Return the cell values for an app row or a header row.
+
+        Styled cells are built as Text objects so DataTable skips markup parsing.
+        """
+        if app is None:
+            return label, "", ""
+        checkbox = _CHECKED if app.package_name in self.selected_packages else _UNCHECKED
+        status, color, _ = _STATUS_META[app.optimization_status]
+        return checkbox, app.package_name, RichText(status, style=color)
 
-            row_key = table.add_row(f"[bold cyan]{group}[/bold cyan]", "", "")
-            self.row_keys[row_idx] = row_key
-            logging.debug(f"Added header row {row_idx} for group: {group}")
-            row_idx += 1
-
-            apps_in_group = sorted(grouped[group], key=lambda x: x.package_name)
-            for app in apps_in_group:
-                checkbox = "☑" if app.package_name in self.selected_packages else "☐"
-                status = app.optimization_status.get_status_name()
-                color = app.optimization_status.get_color()
-
-                row_key = table.add_row(
-                    checkbox,
-                    app.package_name,
-                    f"[{color}]{status}[/]",
-                )
+    def update_apps_display(self) -> None:
+        """Update the apps list display grouped by status unless sorting is active.
+
+        Rows are keyed by package name, so when the new rows are the current
+        ones minus a few removals plus some appended at the end, only that
+        difference is applied. Any other change rebuilds the table.
+        """
+        table = self._table
+        rows = self._build_rows()
+        row_keys = [key for key, _, _ in rows]
+        wanted = set(row_keys)
+        kept = [key for key in self._displayed_keys if key in wanted]
+
+        too_many_removals = len(self._displayed_keys) - len(kept) > self.MAX_ROW_REMOVALS
+        if too_many_removals or kept != row_keys[:len(kept)]:
+            table.clear()
+            self._displayed_keys = {}
+            kept = []
+
+        removed = [key for key in self._displayed_keys if key not in wanted]
+        for key in removed:
+            table.remove_row(self._displayed_keys.pop(key))
+        for key, app, label in rows[len(kept):]:
+            self._displayed_keys[key] = table.add_row(*self._row_cells(app, label), key=key)
+
+        self.row_to_app = {}
+        self.row_keys = {}
+        for row_idx, (key, app, _) in enumerate(rows):
+            self.row_keys[row_idx] = self._displayed_keys[key]
+            if app is not None:
                 self.row_to_app[row_idx] = app.package_name
-                self.row_keys[row_idx] = row_key
-                logging.debug(
-                    f"Mapped row {row_idx} -> {app.package_name} (key: {row_key})"
-                )
-                row_idx += 1
 
         logging.debug(
-            f"Total rows added: {row_idx}, row_to_app mapping has {len(self.row_to_app)} entries, row_keys has {len(self.row_keys)} entries"
+            f"Total rows: {len(rows)} (removed {len(removed)}, added {len(rows) - len(kept)}), row_to_app mapping has {len(self.row_to_app)} entries"
         )
 
+    def _set_checkboxes(self, packages: Set[str], glyph: str) -> None:
+        """Set the checkbox cell of the displayed rows for the given packages."""
+        table = self._table
+        for package_name in packages:
+            row_key = self._displayed_keys.get(package_name)
+            if row_key is not None:
+                table.update_cell(row_key, self.column_keys[0], glyph)
+
     def action_select_all(self) -> None:
         """Select all apps in filtered list."""
-        for app in self.filtered_apps:
-            self.selected_packages.add(app.package_name)
-        self.update_apps_display()
+        newly_selected = {app.package_name for app in self.filtered_apps} - self.selected_packages
+        self.selected_packages |= newly_selected
+        self._set_checkboxes(newly_selected, _CHECKED)
 
     def action_deselect_all(self) -> None:
         """Deselect all apps."""
+        deselected = set(self.selected_packages)
         self.selected_packages.clear()
-        self.update_apps_display()
+        self._set_checkboxes(deselected, _UNCHECKED)
 
     def on_key(self, event) -> None:
         """Log all key presses for debugging."""
-        logging.debug(f"Key pressed: {event.key}")
+        logging.debug("Key pressed: %s", event.key)
 
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         """Handle row selection (clicking on row)."""
@@ -413,11 +590,12 @@ class AppSelectionScreen(Screen):
 
     def toggle_row_by_index(self, row_idx: int) -> None:
         """Toggle selection for a specific row index."""
-        table = self.query_one("#apps_table", DataTable)
+        table = self._table
         try:
             logging.debug(f"Toggling row {row_idx}")
-            logging.debug(f"row_to_app mapping: {self.row_to_app}")
-            logging.debug(f"row_keys mapping: {self.row_keys}")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"row_to_app mapping: {self.row_to_app}")
+                logging.debug(f"row_keys mapping: {self.row_keys}")
 
             # Check if this row corresponds to an app (not a header)
             if row_idx in self.row_to_app and row_idx in self.row_keys:
@@ -434,7 +612,7 @@ class AppSelectionScreen(Screen):
                     logging.debug(f"Selected {package_name}")
 
                 # Update just this row's checkbox using the row_key and column_key
-                checkbox = "☑" if package_name in self.selected_packages else "☐"
+                checkbox = _CHECKED if package_name in self.selected_packages else _UNCHECKED
                 table.update_cell(row_key, self.column_keys[0], checkbox)
                 logging.debug(f"Updated checkbox to {checkbox} at row_key={row_key}, col_key={self.column_keys[0]}")
             else:
@@ -447,16 +625,14 @@ class AppSelectionScreen(Screen):
 
     def action_toggle_row(self) -> None:
         """Toggle selection of current row (spacebar)."""
-        table = self.query_one("#apps_table", DataTable)
-        cursor_row = table.cursor_row
+        cursor_row = self._table.cursor_row
         logging.debug(f"action_toggle_row called, cursor at {cursor_row}")
         self.toggle_row_by_index(cursor_row)
 
     def action_focus_table(self) -> None:
         """Focus the table widget."""
         logging.debug("Focusing table")
-        table = self.query_one("#apps_table", DataTable)
-        table.focus()
+        self._table.focus()
 
     def action_exit_no_selection(self) -> None:
         """Exit without selection."""
@@ -468,7 +644,8 @@ class AppSelectionScreen(Screen):
         if not self.selected_packages:
             logging.debug("No packages selected, returning")
             return
-        selected_apps = [app for app in self.apps if app.package_name in self.selected_packages]
+        # Keep the list order (status group, then name) for the summary and compile queue
+        selected_apps = [app for app in self._sorted_apps if app.package_name in self.selected_packages]
         logging.debug(f"Selected {len(selected_apps)} apps: {[a.package_name for a in selected_apps]}")
         self.app.selected_apps = selected_apps
         # Push profile selection screen
@@ -483,28 +660,6 @@ class AppSelectionScreen(Screen):
             self.app.exit()
 
 
-class ProfileItem(Static):
-    """Clickable profile item widget."""
-
-    def __init__(self, profile: str, description: str, parent_screen: 'ProfileSelectionScreen'):
-        super().__init__()
-        self.profile = profile
-        self.description = description
-        self.parent_screen = parent_screen
-
-    def render(self) -> RichText:
-        """Render the profile item."""
-        marker = "→" if self.parent_screen.selected_profile == self.profile else " "
-        text_str = f"{marker} [cyan]●[/cyan] [bold]{self.profile:<20}[/bold] - {self.description}"
-        return RichText.from_markup(text_str)
-
-    def on_click(self) -> None:
-        """Handle click to select profile."""
-        self.parent_screen.selected_profile = self.profile
-        self.refresh()
-        self.parent_screen.update_profiles_display()
-
-
 class ProfileSelectionScreen(Screen):
     """Screen for selecting optimization profile."""
 
@@ -531,6 +686,7 @@ class ProfileSelectionScreen(Screen):
         self.row_to_profile: Dict[int, str] = {}  # Map row index to profile name
         self.row_keys: Dict[int, str] = {}  # Map row index to DataTable RowKey
         self.column_keys = []  # Store ColumnKey objects: [marker_col, profile_col, desc_col]
+        self._table: Optional[DataTable] = None  # Cached on mount
 
     def compose(self) -> ComposeResult:
         """Compose the screen layout."""
@@ -547,7 +703,7 @@ class ProfileSelectionScreen(Screen):
 
     def on_mount(self) -> None:
         """Initialize the screen."""
-        table = self.query_one("#profiles_table", DataTable)
+        self._table = table = self.query_one("#profiles_table", DataTable)
         # Store column keys returned by add_columns
         self.column_keys = table.add_columns("", "Profile", "Description")
         logging.debug(f"Profile column keys: {self.column_keys}")
@@ -555,7 +711,7 @@ class ProfileSelectionScreen(Screen):
 
     def update_profiles_display(self) -> None:
         """Update profiles display."""
-        table = self.query_one("#profiles_table", DataTable)
+        table = self._table
         table.clear()
         self.row_to_profile = {}
         self.row_keys = {}
@@ -578,11 +734,12 @@ class ProfileSelectionScreen(Screen):
 
     def select_profile_by_index(self, row_idx: int) -> None:
         """Select profile at specific row index."""
-        table = self.query_one("#profiles_table", DataTable)
+        table = self._table
         try:
             logging.debug(f"Selecting profile at row {row_idx}")
-            logging.debug(f"row_to_profile mapping: {self.row_to_profile}")
-            logging.debug(f"row_keys mapping: {self.row_keys}")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"row_to_profile mapping: {self.row_to_profile}")
+                logging.debug(f"row_keys mapping: {self.row_keys}")
 
             # Check if this row corresponds to a profile
             if row_idx in self.row_to_profile and row_idx in self.row_keys:
@@ -611,8 +768,7 @@ class ProfileSelectionScreen(Screen):
 
     def action_select_profile(self) -> None:
         """Select profile from current row (spacebar)."""
-        table = self.query_one("#profiles_table", DataTable)
-        cursor_row = table.cursor_row
+        cursor_row = self._table.cursor_row
         logging.debug(f"action_select_profile called, cursor at {cursor_row}")
         self.select_profile_by_index(cursor_row)
 
@@ -648,6 +804,9 @@ class ProfileSelectionScreen(Screen):
 class OptimizationProgressScreen(Screen):
     """Screen showing optimization progress."""
 
+    # Number of Shizuku sessions compiling apps concurrently
+    POOL_SIZE = 4
+
     def __init__(self, apps: List[AppInfo], profile: str, shizuku: ShizukuWrapper):
         super().__init__()
         self.apps = apps
@@ -656,6 +815,9 @@ class OptimizationProgressScreen(Screen):
         self.success_count = 0
         self.failed_count = 0
         self.current_app_idx = 0
+        self._status: Optional[Label] = None  # Widgets cached on mount
+        self._log: Optional[RichLog] = None
+        self._progress: Optional[ProgressBar] = None
 
     def compose(self) -> ComposeResult:
         """Compose the screen layout."""
@@ -682,41 +844,71 @@ class OptimizationProgressScreen(Screen):
     def on_mount(self) -> None:
         """Start optimization process."""
         logging.debug(f"OptimizationProgressScreen mounted. Apps: {len(self.apps)}, Profile: {self.profile}")
+        self._status = self.query_one("#status_label", Label)
+        self._log = self.query_one("#optimization_log", RichLog)
+        self._progress = self.query_one("#progress", ProgressBar)
         self.update_status("Starting optimization...")
-        self.call_later(self.optimize)
+        self.optimize()
 
     def update_status(self, message: str) -> None:
         """Update status label."""
         try:
-            status = self.query_one("#status_label", Label)
-            status.update(f"[cyan]{message}[/cyan]")
-        except:
+            self._status.update(f"[cyan]{message}[/cyan]")
+        except Exception:
             pass
 
-    def optimize(self) -> None:
-        """Run optimization process."""
+    @work(exclusive=True)
+    async def optimize(self) -> None:
+        """Run optimization process across a pool of Shizuku sessions.
+
+        Runs as a worker; the blocking Shizuku I/O happens in threads, so the
+        log and progress bar repaint as each app finishes.
+        """
         logging.debug("optimize() called")
-        log = self.query_one("#optimization_log", RichLog)
-        progress = self.query_one("#progress", ProgressBar)
-
-        for idx, app in enumerate(self.apps):
-            logging.debug(f"Optimizing {idx+1}/{len(self.apps)}: {app.package_name}")
-            self.update_status(f"Processing {idx+1}/{len(self.apps)}: {app.package_name}")
-            log.write(f"[cyan][{idx+1}/{len(self.apps)}][/cyan] Optimizing {app.package_name}...")
-
-            command = f'cmd package compile -m "{self.profile}" -f "{app.package_name}"'
-            logging.debug(f"Executing: {command}")
-            result = self.shizuku.execute_command(command)
-            logging.debug(f"Result: {result[:200]}...")
-
-            if "Error" not in result and "error" not in result.lower():
-                log.write("[green]✓ Done[/green]")
-                self.success_count += 1
-            else:
-                log.write("[red]✗ Failed[/red]")
-                self.failed_count += 1
+        log = self._log
+        progress = self._progress
+        total = len(self.apps)
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for app in self.apps:
+            pending.put_nowait(app)
+
+        # Reuse the app's session and open the extra ones off the event loop
+        extra = [ShizukuWrapper(self.shizuku.timeout) for _ in range(min(self.POOL_SIZE, total) - 1)]
+        connected = await asyncio.gather(*(asyncio.to_thread(s.connect) for s in extra))
+        pool = [self.shizuku] + [s for s, ok in zip(extra, connected) if ok]
+        logging.debug(f"Optimizing {total} apps with {len(pool)} Shizuku sessions")
+
+        started = 0
+
+        async def worker(shizuku: ShizukuWrapper) -> None:
+            nonlocal started
+            while not pending.empty():
+                app = pending.get_nowait()
+                started += 1
+                self.update_status(f"Processing {started}/{total}: {app.package_name}")
+                log.write(f"[cyan][{started}/{total}][/cyan] Optimizing {app.package_name}...")
+
+                command = f'cmd package compile -m "{self.profile}" -f "{app.package_name}"'
+                logging.debug(f"Executing: {command}")
+                result = await asyncio.to_thread(shizuku.execute_command, command)
+                logging.debug(f"Result: {result[:200]}...")
+
+                # Workers run side by side, so name the app each result belongs to
+                if "error" not in result.lower():
+                    log.write(f"[green]✓ Done[/green] {app.package_name}")
+                    self.success_count += 1
+                else:
+                    log.write(f"[red]✗ Failed[/red] {app.package_name}")
+                    self.failed_count += 1
 
-            progress.update(advance=1)
+                progress.update(advance=1)
+
+        try:
+            await asyncio.gather(*(worker(s) for s in pool))
+        finally:
+            for s in extra:
+                await asyncio.to_thread(s.close)
 
         # Move to summary screen
         logging.debug(f"Optimization complete. Success: {self.success_count}, Failed: {self.failed_count}")
@@ -891,61 +1083,120 @@ class ShizukuOptimizerApp:
                 # Set Flexoki theme
                 self.theme = "flexoki"
 
-                # Connect to Shizuku
-                if not self.shizuku.connect():
+                # Connect and fetch apps in one worker
+                self.fetch_apps_and_show_selection()
+
+            @work(exclusive=True)
+            async def fetch_apps_and_show_selection(self) -> None:
+                """Fetch apps and show selection screen.
+
+                Runs as a worker with the Shizuku round-trip in a thread, so the
+                UI keeps responding while the device answers. The selection
+                screen is shown right away and filled in when the package list
+                arrives; optimization statuses follow once the dexopt dump is parsed.
+                """
+                screen = AppSelectionScreen([], loading=True)
+                self.push_screen(screen)
+
+                # Open the session that every later command reuses while the
+                # loading screen is already up
+                if not await asyncio.to_thread(self.shizuku.connect):
                     self.title = "Failed to connect to Shizuku"
-                    self.call_later(self.exit)
+                    self.exit()
                     return
 
-                # Fetch apps
-                self.fetch_apps_and_show_selection()
-
-            def fetch_apps_and_show_selection(self) -> None:
-                """Fetch apps and show selection screen."""
-                # Get list of user-installed packages
-                packages_output = self.shizuku.execute_command(
-                    "pm list packages -3 | sed 's/package://'"
+                # List the packages first; their statuses come from the much
+                # larger dexopt dump, which is fetched once the list is shown
+                packages_output = await asyncio.to_thread(
+                    self.shizuku.execute_command, "pm list packages -3"
                 )
 
                 if not packages_output or "Error" in packages_output:
                     self.title = "Error fetching packages"
+                    screen.post_message(AppsParsed([]))
                     return
 
-                packages = [pkg.strip() for pkg in packages_output.split('\n') if pkg.strip()]
+                packages = [
+                    line.removeprefix('package:')
+                    for line in packages_output.splitlines()
+                    if line.startswith('package:')
+                ]
 
-                # Get dexopt status for all apps
-                dexopt_output = self.shizuku.execute_command("dumpsys package dexopt")
-                if not dexopt_output or "Error" in dexopt_output:
-                    dexopt_output = ""
+                # Create AppInfo objects in list display order
+                self.optimizer.apps = sorted(
+                    (AppInfo(package, OptimizationStatus.UNKNOWN) for package in packages),
+                    key=_display_key,
+                )
 
-                # Parse and create AppInfo objects
-                self.optimizer.apps = []
-                for package in packages:
-                    status = self._parse_optimization_status(package, dexopt_output)
-                    self.optimizer.apps.append(AppInfo(package, status))
+                screen.post_message(AppsParsed(self.optimizer.apps))
+                if not self.optimizer.apps:
+                    return
 
-                # Sort by status and name
-                self.optimizer.apps.sort(
-                    key=lambda x: (x.optimization_status.value[0], x.package_name)
+                # The dexopt dump stays as bytes; only the fields parsed out of
+                # it are decoded
+                dexopt_output = await asyncio.to_thread(
+                    self.shizuku.execute_command_bytes, "dumpsys package dexopt"
                 )
+                if not dexopt_output or b"Error" in dexopt_output:
+                    logging.warning("Could not fetch dexopt status, leaving apps as unknown")
+                    return
 
-                # Show app selection screen
-                self.push_screen(AppSelectionScreen(self.optimizer.apps))
-
-            def _parse_optimization_status(self, package: str, dexopt_output: str) -> OptimizationStatus:
-                """Parse optimization status from dexopt output."""
-                try:
-                    pattern = rf'\[{re.escape(package)}\].*?(?:arm64:|arm:).*?\[status=([^\]]+)\]'
-                    match = re.search(pattern, dexopt_output, re.DOTALL)
-                    if match:
-                        status = match.group(1).lower().strip()
-                        return OptimizationStatus.from_string(status)
-                except:
-                    pass
-                return OptimizationStatus.UNKNOWN
+                status_map = self._parse_dexopt_statuses(dexopt_output, packages)
+                statuses = {
+                    package: self._parse_optimization_status(package, status_map)
+                    for package in packages
+                }
+                screen.post_message(StatusesReady(statuses))
+
+            def _parse_dexopt_statuses(self, dexopt_output: bytes, packages: List[str]) -> Dict[str, str]:
+                """Map each of the given packages to the status of its first ISA entry.
+
+                The dump is read in one pass. Blocks of other packages (system
+                apps make up most of it) are skipped, and reading stops once
+                every wanted package has a status.
+                """
+                wanted = {package.encode() for package in packages}
+                status_map: Dict[str, str] = {}
+                current_pkg: Optional[str] = None
+                for line in dexopt_output.splitlines():
+                    stripped = line.strip()
+                    # A `[package.name]` line opens each package block; bracketed
+                    # notes such as `[location is ...]` contain spaces
+                    if stripped.startswith(b'[') and stripped.endswith(b']') and b' ' not in stripped:
+                        name = stripped[1:-1]
+                        current_pkg = None
+                        if name in wanted:
+                            package = name.decode('ascii', 'replace')
+                            # A package listed again later keeps its first status
+                            if package not in status_map:
+                                current_pkg = package
+                        continue
+                    if current_pkg is None:
+                        continue
+                    if stripped.startswith((b'arm64:', b'arm:')):
+                        start = stripped.find(b'[status=')
+                        if start != -1:
+                            end = stripped.find(b']', start)
+                            status = stripped[start + 8:end].decode('ascii', 'replace')
+                            status_map[current_pkg] = status.lower().strip()
+                            # Only the first ISA entry of a package counts
+                            current_pkg = None
+                            if len(status_map) == len(wanted):
+                                break
+                return status_map
+
+            def _parse_optimization_status(self, package: str, status_map: Dict[str, str]) -> OptimizationStatus:
+                """Look up a package's optimization status in the parsed dexopt statuses."""
+                status = status_map.get(package)
+                if status is None:
+                    return OptimizationStatus.UNKNOWN
+                return OptimizationStatus.from_string(status)
 
         app = OptimizerApp()
-        app.run()
+        try:
+            app.run()
+        finally:
+            self.shizuku.close()
 
 
 def main():
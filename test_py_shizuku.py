@@ -1,49 +1,103 @@
-import pexpect
+import os
+import select
+import subprocess
+import time
 
-def run_shizuku_command(command):
+# Sentinel echoed after every command, followed by its exit status
+END_MARKER = '__END__'
+
+
+class ShizukuShell:
     """
-    Run command through Shizuku interactive shell
+    Persistent Shizuku shell; commands are framed with a sentinel echo
     """
-    try:
-        # Start shizuku
-        child = pexpect.spawn('shizuku', encoding='utf-8', timeout=30)
-        
-        # Wait for the shell prompt
-        child.expect(r'\$ ')
-        
-        # Send the command
-        child.sendline(command)
-        
-        # Wait for the prompt again (command completed)
-        child.expect(r'\$ ')
-        
-        # Get the output (everything before the prompt)
-        output = child.before
-        
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self.process = None
+        self.error = None  # Returned by run() when there is no usable shell
+        self._buffer = b''
+
+    def __enter__(self):
+        # Start shizuku once and reuse it for every command
+        try:
+            self.process = subprocess.Popen(
+                ['shizuku'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+        except OSError as e:
+            self.error = f"Error: {str(e)}"
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.process is None:
+            return
         # Send exit to close properly
-        child.sendline('exit')
-        child.wait()
-        
-        # Clean up the output (remove the echoed command line)
-        lines = output.split('\n')
-        # Remove first line (the echoed command)
-        if lines and command in lines[0]:
-            lines = lines[1:]
-        
-        return '\n'.join(lines).strip()
-        
-    except pexpect.TIMEOUT:
-        return "Command timed out"
-    except Exception as e:
-        return f"Error: {str(e)}"
-
-# Install pexpect first: pkg install python-pexpect
-print("Listing user-installed packages:")
-output = run_shizuku_command("pm list packages -3")
-print(output)
-
-print("\n" + "="*50 + "\n")
-
-print("Getting Android version:")
-output = run_shizuku_command("getprop ro.build.version.release")
-print(output)
+        try:
+            self.process.stdin.write(b'exit\n')
+            self.process.stdin.flush()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+
+    def run(self, command):
+        """
+        Run command through the Shizuku shell and return its output
+        """
+        if self.process is None:
+            return self.error
+
+        try:
+            # Send the command followed by the sentinel
+            self.process.stdin.write(f"{command}\necho {END_MARKER}$?\n".encode())
+            self.process.stdin.flush()
+
+            # Collect output lines until the sentinel line
+            fd = self.process.stdout.fileno()
+            deadline = time.monotonic() + self.timeout
+            buffer = self._buffer
+            lines = []
+            start = 0
+            while True:
+                end = buffer.find(b'\n', start)
+                while end != -1:
+                    line = buffer[start:end].decode('utf-8', 'replace')
+                    start = end + 1
+                    # Fixed-string check; the sentinel ends the line, so no regex is needed
+                    head, marker, status = line.rpartition(END_MARKER)
+                    if marker and status.isdigit():
+                        # Output without a trailing newline shares the sentinel's line
+                        lines.append(head)
+                        self._buffer = buffer[start:]
+                        return '\n'.join(lines).strip()
+                    lines.append(line)
+                    end = buffer.find(b'\n', start)
+
+                remaining = deadline - time.monotonic()
+                ready = select.select([fd], [], [], remaining)[0] if remaining > 0 else []
+                if not ready:
+                    # The command is still running, so the shell can't be reused
+                    self.process.kill()
+                    self.process = None
+                    self.error = "Error: Shizuku shell stopped after a timeout"
+                    return "Command timed out"
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    return "Error: Shizuku shell exited"
+                buffer = buffer[start:] + chunk
+                start = 0
+
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+
+with ShizukuShell() as sh:
+    print("Listing user-installed packages:")
+    print(sh.run("pm list packages -3"))
+
+    print("\n" + "="*50 + "\n")
+
+    print("Getting Android version:")
+    print(sh.run("getprop ro.build.version.release"))